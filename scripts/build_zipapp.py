@@ -0,0 +1,67 @@
+"""
+Build a single-file zipapp of the Arachne CLI.
+
+The archive holds the ``src`` package as pre-compiled, sourceless ``.pyc``
+files plus a ``__main__`` that calls ``src.cli.main:main``, so startup reads
+one file instead of stat-ing and compiling the source tree. Third-party
+dependencies are not bundled: compiled extensions (pydantic-core, msgspec,
+orjson) cannot be imported from a zip, so they come from the interpreter's
+site-packages.
+
+Usage:
+    python scripts/build_zipapp.py [--output dist/arachne]
+"""
+
+import argparse
+import py_compile
+import tempfile
+import zipapp
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# -I skips user site-packages and PYTHON* variables; site-packages stays
+# enabled because the dependencies live there.
+INTERPRETER = "/usr/bin/env -S python3 -I -X frozen_modules=on"
+
+MAIN = "from src.cli.main import main\n\nmain()\n"
+
+
+def stage(dest: Path) -> None:
+    """Compile the src package into dest as sourceless .pyc files."""
+    for source in sorted((ROOT / "src").rglob("*.py")):
+        relative = source.relative_to(ROOT)
+        target = dest / relative.with_suffix(".pyc")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # optimize=1 drops asserts but keeps docstrings, which Click uses as help
+        py_compile.compile(
+            str(source),
+            cfile=str(target),
+            dfile=str(relative),
+            doraise=True,
+            optimize=1,
+        )
+    (dest / "__main__.py").write_text(MAIN)
+
+
+def build(output: Path) -> Path:
+    """Build the zipapp at output and return its path."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        staging = Path(tmp)
+        stage(staging)
+        # Stored rather than deflated: decompression would cost more than it saves
+        zipapp.create_archive(staging, target=output, interpreter=INTERPRETER)
+    return output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", "-o", default=str(ROOT / "dist" / "arachne"), help="Archive path")
+    args = parser.parse_args()
+
+    print(f"Built {build(Path(args.output))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Thin client for the Arachne daemon.
+
+Forwards argv to a running `arachne daemon` over a Unix socket and prints
+the result. Only the standard library is imported here so the client starts
+in a few milliseconds; without a daemon it falls back to the regular CLI.
+"""
+
+import json
+import os
+import socket
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Messages are a 4-byte big-endian length followed by UTF-8 JSON
+_HEADER = struct.Struct('>I')
+
+
+def default_socket_path() -> Path:
+    """Socket location: $XDG_RUNTIME_DIR/arachne.sock, else a per-user temp dir.
+    
+    The fallback directory is named after the uid and created 0700 by the
+    daemon, so other users can neither pre-create the socket nor reach it.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / 'arachne.sock'
+    return Path(tempfile.gettempdir()) / f'arachne-{os.getuid()}' / 'arachne.sock'
+
+
+def owned_by_user(path: Path) -> bool:
+    """Whether path (not followed if a symlink) is ours and not writable by others."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """Send one length-prefixed JSON message."""
+    payload = json.dumps(message).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Receive one length-prefixed JSON message, or None if the peer closed."""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    payload = _recv_exact(sock, _HEADER.unpack(header)[0])
+    if payload is None:
+        return None
+    return json.loads(payload.decode('utf-8'))
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Read exactly size bytes, or None on EOF."""
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def main() -> None:
+    """Console entry point for `arachne-fast`."""
+    argv = sys.argv[1:]
+
+    socket_path = default_socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        # Another user's socket would see our argv and choose our output
+        if not (owned_by_user(socket_path.parent) and owned_by_user(socket_path)):
+            raise PermissionError(f"{socket_path} is missing or not ours")
+        sock.connect(str(socket_path))
+    except OSError:
+        # No daemon we can use: run the command in this process instead
+        sock.close()
+        from src.cli.main import main as cli_main
+        cli_main(argv)
+        return
+
+    with sock:
+        send_message(sock, {'argv': argv, 'cwd': os.getcwd()})
+        response = recv_message(sock)
+
+    if response is None:
+        sys.stderr.write("arachne daemon closed the connection\n")
+        sys.exit(1)
+
+    sys.stdout.write(response['stdout'])
+    sys.stderr.write(response['stderr'])
+    sys.exit(response['exit_code'])
+
+
+if __name__ == '__main__':
+    main()
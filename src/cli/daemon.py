@@ -0,0 +1,177 @@
+"""
+Arachne daemon - serves CLI commands over a Unix socket.
+
+Keeps one warm process (imports, configuration and a running TorManager)
+so repeated invocations through `arachne-fast` skip interpreter and Tor
+bootstrap. Requests are handled one at a time because each one redirects
+the process-wide stdout/stderr while its command runs. Logging is set up
+once at startup and not per command, since a sink added mid-request would
+write into that request's captured stdout.
+"""
+
+import io
+import os
+import socket
+import socketserver
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import click
+
+from src.cli.client import default_socket_path, owned_by_user, recv_message, send_message
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Handles one forwarded invocation per connection."""
+
+    def handle(self) -> None:
+        request = recv_message(self.request)
+        if request is None:
+            return
+        response = self.server.daemon.run(request.get('argv', []), request.get('cwd'))
+        send_message(self.request, response)
+
+
+class _UnixServer(socketserver.UnixStreamServer):
+    """Unix socket server that knows its daemon."""
+
+    def __init__(self, socket_path: Path, daemon: 'ArachneDaemon'):
+        self.daemon = daemon
+        super().__init__(str(socket_path), _RequestHandler)
+
+
+class ArachneDaemon:
+    """Runs CLI commands in-process, sharing state between requests."""
+
+    def __init__(self, config: Any, socket_path: Optional[Path] = None, with_tor: bool = True):
+        self.config = config
+        self.socket_path = socket_path or default_socket_path()
+        self.with_tor = with_tor
+
+        # Passed to Click as ctx.obj, so whatever commands keep there
+        # (e.g. the TorManager) survives across requests
+        self.state: Dict[str, Any] = {'daemon': True}
+
+    def run(self, argv: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
+        """Run one CLI invocation and return its output and exit code."""
+        from src.cli.main import cli
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        previous_cwd = os.getcwd()
+
+        try:
+            if cwd:
+                os.chdir(cwd)
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                exit_code = self._invoke(cli, argv)
+        finally:
+            os.chdir(previous_cwd)
+
+        return {
+            'stdout': stdout.getvalue(),
+            'stderr': stderr.getvalue(),
+            'exit_code': exit_code,
+        }
+
+    def _invoke(self, cli: click.Group, argv: List[str]) -> int:
+        """Invoke the Click group the way standalone mode would."""
+        if argv and argv[0] == 'daemon':
+            click.echo("Error: already running inside the daemon", err=True)
+            return 2
+
+        try:
+            rv = cli.main(args=argv, prog_name='arachne', standalone_mode=False, obj=self.state)
+            return rv if isinstance(rv, int) else 0
+        except click.ClickException as e:
+            e.show()
+            return e.exit_code
+        except click.Abort:
+            click.echo("Aborted!", err=True)
+            return 1
+        except SystemExit as e:
+            if e.code is None or isinstance(e.code, int):
+                return e.code or 0
+            click.echo(e.code, err=True)
+            return 1
+        except Exception:
+            traceback.print_exc()
+            return 1
+
+    def _start_tor(self) -> None:
+        """Start the shared TorManager; the daemon still serves without it."""
+        from src.core import create_tor_manager
+
+        tor_manager = create_tor_manager({'tor': self.config.tor.model_dump()})
+        try:
+            tor_manager.start()
+        except Exception as e:
+            logger.warning(f"Tor unavailable, serving without a TorManager: {e}")
+            return
+        self.state['tor_manager'] = tor_manager
+
+    def _claim_socket(self) -> None:
+        """Prepare a private socket directory and remove a stale socket file.
+        
+        Refuses a directory another user owns or can write to, and a socket
+        another daemon still answers on.
+        """
+        socket_dir = self.socket_path.parent
+        socket_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not owned_by_user(socket_dir):
+            raise click.ClickException(
+                f"{socket_dir} must be a directory owned by you and not writable by others"
+            )
+        if not self.socket_path.exists():
+            return
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(self.socket_path))
+        except ConnectionRefusedError:
+            self.socket_path.unlink()
+            return
+        finally:
+            probe.close()
+
+        raise click.ClickException(f"Daemon already running on {self.socket_path}")
+
+    def serve_forever(self) -> None:
+        """Serve requests until interrupted, then clean up."""
+        self._claim_socket()
+        if self.with_tor:
+            self._start_tor()
+
+        # The socket is created owner-only rather than chmod-ed after bind,
+        # so it is never reachable by others, even briefly
+        previous_umask = os.umask(0o077)
+        try:
+            server = _UnixServer(self.socket_path, self)
+        finally:
+            os.umask(previous_umask)
+        logger.info(f"Arachne daemon listening on {self.socket_path}")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Arachne daemon shutting down")
+        finally:
+            server.server_close()
+            self.socket_path.unlink(missing_ok=True)
+            tor_manager = self.state.pop('tor_manager', None)
+            if tor_manager:
+                tor_manager.stop()
+
+
+def serve(config: Any, socket_path: Optional[str] = None, with_tor: bool = True) -> None:
+    """Run the daemon in the foreground."""
+    daemon = ArachneDaemon(
+        config,
+        socket_path=Path(socket_path) if socket_path else None,
+        with_tor=with_tor,
+    )
+    daemon.serve_forever()
@@ -2,27 +2,59 @@
 Command Line Interface for Arachne.
 """
 
+import os
+import sys
 import click
-from typing import Optional
+from typing import Any, Dict, Optional
 from pathlib import Path
 
-from src.utils.logger import setup_logger, get_logger
-from src.utils.config import load_config
+from src import __version__
 
-logger = get_logger(__name__)
+# Heavy subsystems (loguru, pydantic, yaml, stem, selenium) are imported inside
+# the commands that need them so `--help` and light commands start quickly.
+
+DEFAULT_CONFIG = 'configs/default.yaml'
+
+# Served by main() without building the Click group; keep in sync with cli().
+HELP_TEXT = """Usage: arachne [OPTIONS] COMMAND [ARGS]...
+
+  Arachne - Dark Web Scout CLI
+
+Options:
+  --version             Show the version and exit.
+  -c, --config TEXT     Configuration file
+  -l, --log-level TEXT  Log level
+  --help                Show this message and exit.
+
+Commands:
+  classify     Classify discovered sites.
+  daemon       Serve commands over a Unix socket for arachne-fast.
+  discover     Discover new dark web sites.
+  init-db      Initialize database.
+  maintain-db  Create upcoming crawl job partitions; run it from cron.
+  status       Show system status.
+"""
 
 
 @click.group()
-@click.option('--config', '-c', default='configs/default.yaml', help='Configuration file')
+@click.version_option(__version__, prog_name='arachne')
+@click.option('--config', '-c', default=DEFAULT_CONFIG, help='Configuration file')
 @click.option('--log-level', '-l', default='INFO', help='Log level')
 @click.pass_context
 def cli(ctx, config: str, log_level: str):
     """Arachne - Dark Web Scout CLI"""
-    # Setup logging
-    setup_logger(level=log_level)
+    from src.utils.logger import setup_logger, get_logger
+    from src.utils.config import load_config
+    logger = get_logger(__name__)
     
-    # Load configuration
     ctx.ensure_object(dict)
+    
+    # Setup logging; inside the daemon it is already set up, and stdout is
+    # the current request's buffer
+    if not ctx.obj.get('daemon'):
+        setup_logger(level=log_level)
+    
+    # Load configuration
     ctx.obj['config'] = load_config(config)
     
     logger.info(f"Arachne CLI initialized with config: {config}")
@@ -34,6 +66,9 @@ def cli(ctx, config: str, log_level: str):
 @click.pass_context
 def discover(ctx, seeds: Optional[str], depth: int):
     """Discover new dark web sites."""
+    from src.utils.logger import get_logger
+    logger = get_logger(__name__)
+    
     config = ctx.obj['config']
     
     # Use provided seeds or default
@@ -59,6 +94,9 @@ def discover(ctx, seeds: Optional[str], depth: int):
 @click.pass_context
 def classify(ctx, site_id: Optional[str], batch: bool):
     """Classify discovered sites."""
+    from src.utils.logger import get_logger
+    logger = get_logger(__name__)
+    
     config = ctx.obj['config']
     
     if site_id:
@@ -79,23 +117,92 @@ def classify(ctx, site_id: Optional[str], batch: bool):
 def status(ctx):
     """Show system status."""
     config = ctx.obj['config']
+    # Only present when running inside `arachne daemon`
+    tor_manager = ctx.obj.get('tor_manager')
     
+    _print_status(
+        version=config.version,
+        log_level=config.log_level,
+        socks_port=config.tor.socks_port,
+        max_depth=config.discovery.max_depth,
+        tor_stats=tor_manager.get_stats() if tor_manager else None,
+    )
+
+
+def _print_status(
+    version: str,
+    log_level: str,
+    socks_port: int,
+    max_depth: int,
+    tor_stats: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Print the status report shared by the Click command and the fast path."""
     click.echo("=== Arachne Status ===")
-    click.echo(f"Version: {config.version}")
-    click.echo(f"Log Level: {config.log_level}")
-    click.echo(f"Tor SOCKS Port: {config.tor.socks_port}")
-    click.echo(f"Discovery Depth: {config.discovery.max_depth}")
+    click.echo(f"Version: {version}")
+    click.echo(f"Log Level: {log_level}")
+    click.echo(f"Tor SOCKS Port: {socks_port}")
+    click.echo(f"Discovery Depth: {max_depth}")
+    if tor_stats:
+        click.echo(
+            f"Tor Circuits: {tor_stats['active_circuits']} active, "
+            f"{tor_stats['healthy_circuits']} healthy"
+        )
     click.echo("\nCommands:")
     click.echo("  discover - Discover new sites")
     click.echo("  classify - Classify discovered sites")
     click.echo("  status   - Show this status")
 
 
+def _fast_status(config_path: str = DEFAULT_CONFIG) -> bool:
+    """Show status from the raw YAML, skipping logger setup and Pydantic.
+    
+    Returns False, printing nothing, when the result could differ from what
+    load_config would report: a .env file is present (Config reads it), an
+    environment override is set in more than one letter case, or one is not
+    a valid integer. The caller then takes the full Click path.
+    """
+    if Path('.env').exists():
+        return False
+    
+    # Settings match environment names case-insensitively, as _cache_file does
+    names = ('TOR_SOCKS_PORT', 'DISCOVERY_MAX_DEPTH', 'LOG_LEVEL')
+    overrides = [(k.upper(), v) for k, v in os.environ.items() if k.upper() in names]
+    environ = dict(overrides)
+    if len(environ) != len(overrides):
+        return False
+    
+    import yaml
+    
+    raw: Dict[str, Any] = {}
+    if Path(config_path).exists():
+        with open(config_path, 'r') as f:
+            raw = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)) or {}
+    
+    # Same precedence as load_config: YAML value, then environment, then default
+    tor = raw.get('tor') or {}
+    discovery = raw.get('discovery') or {}
+    try:
+        socks_port = int(tor.get('socks_port', environ.get('TOR_SOCKS_PORT', 9050)))
+        max_depth = int(discovery.get('max_depth', environ.get('DISCOVERY_MAX_DEPTH', 3)))
+    except (TypeError, ValueError):
+        return False
+    
+    _print_status(
+        version=raw.get('version', __version__),
+        log_level=raw.get('log_level', environ.get('LOG_LEVEL', 'INFO')),
+        socks_port=socks_port,
+        max_depth=max_depth,
+    )
+    return True
+
+
 @cli.command()
 @click.pass_context
 def init_db(ctx):
     """Initialize database."""
+    from src.utils.logger import get_logger
     from src.storage.database import init_database
+    logger = get_logger(__name__)
     
     config = ctx.obj['config']
     logger.info("Initializing database...")
@@ -108,5 +215,50 @@ def init_db(ctx):
         raise
 
 
+@cli.command()
+@click.pass_context
+def maintain_db(ctx):
+    """Create upcoming crawl job partitions; run it from cron."""
+    from src.utils.logger import get_logger
+    from src.storage.database import maintain_database
+    logger = get_logger(__name__)
+    
+    config = ctx.obj['config']
+    
+    try:
+        maintain_database(config.database)
+        logger.info("Database maintenance finished")
+    except Exception as e:
+        logger.error(f"Database maintenance failed: {e}")
+        raise
+
+
+@cli.command()
+@click.option('--socket', 'socket_path', help='Unix socket path (default: $XDG_RUNTIME_DIR/arachne.sock or a per-user temp dir)')
+@click.option('--tor/--no-tor', default=True, help='Keep a TorManager running between commands')
+@click.pass_context
+def daemon(ctx, socket_path: Optional[str], tor: bool):
+    """Serve commands over a Unix socket for arachne-fast."""
+    from src.cli.daemon import serve
+    
+    serve(ctx.obj['config'], socket_path=socket_path, with_tor=tor)
+
+
+def main(argv: Optional[list] = None) -> None:
+    """Console entry point; answers help, version and status before Click."""
+    args = sys.argv[1:] if argv is None else argv
+    
+    if not args or args[0] in ('-h', '--help'):
+        click.echo(HELP_TEXT, nl=False)
+        sys.exit(0)
+    if args[0] == '--version':
+        click.echo(f"arachne, version {__version__}")
+        sys.exit(0)
+    if args == ['status'] and _fast_status():
+        sys.exit(0)
+    
+    cli(args=args)
+
+
 if __name__ == '__main__':
-    cli()
+    main()
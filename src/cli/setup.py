@@ -8,15 +8,21 @@ setup(
     install_requires=[
         "stem>=1.8.2",
         "requests>=2.31.0",
+        "httpx[http2]>=0.25.0",
+        "httpx-socks>=0.8.0",
         "selenium>=4.15.0",
         "beautifulsoup4>=4.12.2",
         "pydantic>=2.5.0",
+        "pydantic-settings>=2.0.0",
         "loguru>=0.7.2",
         "click>=8.1.7",
+        "msgspec>=0.18.0",
+        "orjson>=3.9.0",
     ],
     entry_points={
         "console_scripts": [
-            "arachne=src.cli.main:cli",
+            "arachne=src.cli.main:main",
+            "arachne-fast=src.cli.client:main",
         ],
     },
 )
@@ -2,6 +2,28 @@
 Arachne Core Modules
 """
 
-from .tor_manager import TorManager, Circuit, CircuitState, create_tor_manager
+import importlib
+
+# Resolved on first access (PEP 562) so importing src.core.models does not
+# pull in stem, requests and selenium via tor_manager.
+_LAZY = {
+    'TorManager': '.tor_manager',
+    'Circuit': '.tor_manager',
+    'CircuitState': '.tor_manager',
+    'create_tor_manager': '.tor_manager',
+}
 
 __all__ = ['TorManager', 'Circuit', 'CircuitState', 'create_tor_manager']
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        module = importlib.import_module(_LAZY[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -2,10 +2,24 @@
 Data models for Arachne.
 """
 
+from __future__ import annotations
+
 from datetime import datetime
 from enum import Enum
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import Annotated, Any
+import msgspec
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+
+# v3 onion address: 56 base32 characters plus the .onion suffix
+ONION_ADDRESS_PATTERN = r'^[a-z2-7]{56}\.onion$'
+
+# Validated in pydantic-core rather than by a Python validator
+OnionAddress = Annotated[
+    str,
+    StringConstraints(min_length=62, max_length=62, pattern=ONION_ADDRESS_PATTERN),
+]
 
 
 class SiteStatus(str, Enum):
@@ -42,79 +56,87 @@ class RiskLevel(str, Enum):
 class Site(BaseModel):
     """Represents a dark web site."""
     id: str = Field(..., description="Unique identifier")
-    onion_address: str = Field(..., description="Onion address (56 characters)")
+    onion_address: OnionAddress = Field(..., description="Onion address (56 characters)")
     first_seen: datetime = Field(default_factory=datetime.utcnow)
-    last_checked: Optional[datetime] = None
+    last_checked: datetime | None = None
     status: SiteStatus = SiteStatus.DISCOVERED
-    category: Optional[SiteCategory] = None
-    subcategory: Optional[str] = None
+    category: SiteCategory | None = None
+    subcategory: str | None = None
     risk_score: float = Field(default=0.0, ge=0.0, le=1.0)
     risk_level: RiskLevel = RiskLevel.LOW
-    language: Optional[str] = None
-    title: Optional[str] = None
-    description: Optional[str] = None
-    
-    @validator('onion_address')
-        if not v.endswith('.onion'):
-            raise ValueError('Onion address must end with .onion')
-        # v3 addresses are 56 characters
-        if len(v) != 56 + 6:  # .onion suffix
-            raise ValueError('Invalid onion address length')
-        return v
+    language: str | None = None
+    title: str | None = None
+    description: str | None = None
+    metadata: dict[str, Any] = Field(default_factory=dict)
+    requires_review: bool = False
+    tags: list[str] = Field(default_factory=list)
+    is_honeypot: bool = False
     
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat(),
-        }
+    # datetimes serialize to ISO 8601 natively, no json_encoders needed
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+
+# Records below are only produced and consumed inside Arachne, so they are
+# msgspec Structs: slotted, cheap to build, and not validated on construction.
+# Constraints such as Confidence are checked when msgspec decodes them.
+# Site stays a Pydantic model because it is validated at the API boundary;
+# msgspec cannot encode it by itself, so serialize with dumps() or pass
+# enc_hook/dec_hook below to msgspec's encoders and decoders.
 
+# A probability-like score in [0, 1]
+Confidence = Annotated[float, msgspec.Meta(ge=0.0, le=1.0)]
 
-class DiscoveryResult(BaseModel):
+
+class DiscoveryResult(msgspec.Struct, frozen=True, kw_only=True):
     """Result of a discovery operation."""
     site: Site
-    source_url: Optional[str] = None
+    source_url: str | None = None
     discovery_method: str
-    confidence: float = Field(default=0.0, ge=0.0, le=1.0)
-    raw_content_hash: Optional[str] = None
+    confidence: Confidence = 0.0
+    raw_content_hash: str | None = None
     processing_time: float = 0.0
 
 
-class ClassificationResult(BaseModel):
+class ClassificationResult(msgspec.Struct, frozen=True, kw_only=True):
     """Result of classification."""
     site_id: str
     category: SiteCategory
-    subcategory: Optional[str]
-    confidence: float
-    features: Dict[str, Any]
+    subcategory: str | None
+    confidence: Confidence
+    features: dict[str, Any]
     model_version: str
-    processed_at: datetime = Field(default_factory=datetime.utcnow)
+    processed_at: datetime = msgspec.field(default_factory=datetime.utcnow)
 
 
 class SafetyCheckResult(BaseModel):
     """Result of safety checking."""
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     site_id: str
     is_safe: bool
-    flagged_categories: List[str] = Field(default_factory=list)
-    risk_factors: List[str] = Field(default_factory=list)
+    flagged_categories: list[str] = Field(default_factory=list)
+    risk_factors: list[str] = Field(default_factory=list)
     action_taken: str  # "allow", "block", "review"
     checked_at: datetime = Field(default_factory=datetime.utcnow)
 
 
-class CrawlJob(BaseModel):
+class CrawlJob(msgspec.Struct, kw_only=True):
     """Job for crawling a site."""
+    # Jobs change status as they run, so they stay mutable
     id: str
     url: str
     priority: int = 0
     max_depth: int = 1
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    scheduled_for: Optional[datetime] = None
+    created_at: datetime = msgspec.field(default_factory=datetime.utcnow)
+    scheduled_for: datetime | None = None
     status: str = "pending"
     retry_count: int = 0
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: dict[str, Any] = msgspec.field(default_factory=dict)
 
 
-class SystemMetrics(BaseModel):
+class SystemMetrics(msgspec.Struct, frozen=True, kw_only=True):
     """System performance metrics."""
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = msgspec.field(default_factory=datetime.utcnow)
     circuits_active: int
     circuits_total: int
     sites_discovered: int
@@ -122,9 +144,36 @@ class SystemMetrics(BaseModel):
     requests_per_minute: float
     error_rate: float
     memory_usage_mb: float
-    cpu_percent: float        """Validate onion address format."""
-    def validate_onion_address(cls, v):
-    metadata: Dict[str, Any] = Field(default_factory=dict)
-    requires_review: bool = False
-    tags: List[str] = Field(default_factory=list)
-    is_honeypot: bool = False
+    cpu_percent: float
+
+
+# Naive datetimes here are UTC (datetime.utcnow), so emit them with an offset
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Convert models orjson cannot encode natively; nested ones recurse."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, msgspec.Struct):
+        return msgspec.structs.asdict(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def enc_hook(obj: Any) -> Any:
+    """msgspec enc_hook for the Pydantic models nested in Structs."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise NotImplementedError(f"Objects of type {type(obj).__name__} are not supported")
+
+
+def dec_hook(type_: type, obj: Any) -> Any:
+    """msgspec dec_hook that validates Pydantic models nested in Structs."""
+    if isinstance(type_, type) and issubclass(type_, BaseModel):
+        return type_.model_validate(obj)
+    raise NotImplementedError(f"Objects of type {type_} are not supported")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize models (or lists/dicts of them) to JSON bytes."""
+    return orjson.dumps(obj, default=_orjson_default, option=_ORJSON_OPTIONS)
@@ -2,24 +2,51 @@
 Tor Manager - Handles all Tor network operations with circuit isolation.
 """
 
+from __future__ import annotations
+
 import time
+import heapq
 import random
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import threading
+import types
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+from dataclasses import dataclass, field
 from enum import Enum
 from contextlib import contextmanager
 
 import stem
 from stem.control import Controller
-from stem.process import launch_tor_with_config
 import requests
-from selenium import webdriver
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.firefox.service import Service as FirefoxService
+from requests.adapters import HTTPAdapter
+
+# Selenium, stem.process and httpx are imported where used; most runs never
+# need all of them
+if TYPE_CHECKING:
+    import httpx
+    from selenium import webdriver
 
 logger = logging.getLogger(__name__)
 
+# Seconds a dead circuit is kept around before it is forgotten entirely
+DEAD_CIRCUIT_RETENTION = 60
+
+# Hard limits after which a circuit is no longer healthy
+MAX_CIRCUIT_AGE = 600  # 10 minutes
+MAX_CIRCUIT_REQUESTS = 100
+
+# In production, load from file
+_USER_AGENTS: tuple[str, ...] = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/119.0',
+)
+
+# User agents drawn per refill of the per-manager buffer
+_USER_AGENT_BATCH = 64
+
 
 class CircuitState(Enum):
     """State of a Tor circuit."""
@@ -29,42 +56,74 @@ class CircuitState(Enum):
     DEAD = "dead"
 
 
-@dataclass
+@dataclass(slots=True)
 class Circuit:
-    """Represents a Tor circuit."""
+    """Represents a Tor circuit.
+    
+    Timestamps come from time.monotonic(), so they are only meaningful
+    relative to each other and are immune to wall-clock adjustments.
+    """
     id: str
     state: CircuitState
     created_at: float
     request_count: int = 0
-    last_used: Optional[float] = None
-    entry_node: Optional[str] = None
-    exit_node: Optional[str] = None
+    last_used: float | None = None
+    entry_node: str | None = None
+    exit_node: str | None = None
+    died_at: float | None = None
+    # Monotonic time after which the circuit is too old to use
+    healthy_until: float | None = None
+    # Cleared once the circuit dies or exceeds its request budget
+    _healthy: bool = field(default=True, init=False, repr=False)
+    
+    def __post_init__(self) -> None:
+        if self.healthy_until is None:
+            self.healthy_until = self.created_at + MAX_CIRCUIT_AGE
+    
+    def mark_dead(self, now: float | None = None) -> None:
+        """Mark circuit as dead, remembering when it died."""
+        self.state = CircuitState.DEAD
+        self._healthy = False
+        if self.died_at is None:
+            self.died_at = time.monotonic() if now is None else now
     
-    @property
-    def age(self) -> float:
-        """Return circuit age in seconds."""
-        return time.time() - self.created_at
+    def age(self, now: float | None = None) -> float:
+        """Return circuit age in seconds at monotonic time ``now``."""
+        if now is None:
+            now = time.monotonic()
+        return now - self.created_at
     
-    @property
-    def is_healthy(self) -> bool:
-        """Check if circuit is healthy for use."""
-        if self.state == CircuitState.DEAD:
-            return False
-        if self.age > 600:  # 10 minutes max
-            return False
-        if self.request_count > 100:  # Max requests per circuit
-            return False
-        return True
+    def record_use(self, now: float) -> None:
+        """Count a request made on the circuit at monotonic time ``now``."""
+        self.request_count += 1
+        self.last_used = now
+        if self.request_count > MAX_CIRCUIT_REQUESTS:
+            self._healthy = False
+    
+    def is_healthy(self, now: float | None = None) -> bool:
+        """Check if circuit is healthy for use at monotonic time ``now``."""
+        if now is None:
+            now = time.monotonic()
+        return self._healthy and now <= self.healthy_until and self.state is not CircuitState.DEAD
 
 
 class TorManager:
     """Manages Tor connections and circuit isolation."""
     
+    # Headers to mimic browser; User-Agent is chosen per session
+    _DEFAULT_HEADERS: Mapping[str, str] = types.MappingProxyType({
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.5',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+    })
+    
     def __init__(
         self,
         socks_port: int = 9050,
         control_port: int = 9051,
-        control_password: Optional[str] = None,
+        control_password: str | None = None,
         max_circuits: int = 10,
         circuit_lifetime: int = 600,  # 10 minutes
     ):
@@ -74,12 +133,31 @@ class TorManager:
         self.max_circuits = max_circuits
         self.circuit_lifetime = circuit_lifetime
         
-        self.controller: Optional[Controller] = None
-        self.circuits: Dict[str, Circuit] = {}
-        self.active_circuits: List[str] = []
+        self.controller: Controller | None = None
+        self.circuits: dict[str, Circuit] = {}
+        # Live circuit ids, least recently used first
+        self.active_circuits: OrderedDict[str, None] = OrderedDict()
+        # (request_count, last_used, circuit_id); entries that no longer match
+        # the circuit are stale and get discarded when they reach the top
+        self._healthy_heap: list[tuple[int, float, str]] = []
+        # (died_at, circuit_id) in death order, for pruning old dead circuits
+        self._dead_circuits: deque[tuple[float, str]] = deque()
         
         self._tor_process = None
-        self._session_cache: Dict[str, requests.Session] = {}
+        self._session_cache: dict[str, requests.Session] = {}
+        self._async_clients: dict[str, httpx.AsyncClient] = {}
+        # Clients of dropped circuits, closed on the next async call
+        self._retired_async_clients: list[httpx.AsyncClient] = []
+        # Mounted on every circuit's session. The adapter keeps one SOCKS
+        # proxy manager (with its own pools) per proxy URL, and each circuit
+        # has its own URL, so a circuit's manager is released with it
+        self._adapter = HTTPAdapter(
+            pool_connections=max_circuits,
+            pool_maxsize=max_circuits * 4,
+            pool_block=True,
+        )
+        self._rng = random.Random()
+        self._ua_buf: deque[str] = deque()
         
     def start(self) -> None:
         """Start Tor and establish control connection."""
@@ -96,6 +174,8 @@ class TorManager:
             
         except stem.SocketError:
             # Launch new Tor process
+            from stem.process import launch_tor_with_config
+            
             logger.info("Starting new Tor process...")
             
             tor_config = {
@@ -108,14 +188,22 @@ class TorManager:
                 'NumEntryGuards': '3',
             }
             
+            bootstrapped = threading.Event()
+            
+            def on_init_msg(line: str) -> None:
+                logger.debug(f"TOR: {line}")
+                if "Bootstrapped 100" in line:
+                    bootstrapped.set()
+            
             self._tor_process = launch_tor_with_config(
                 config=tor_config,
-                init_msg_handler=lambda line: logger.debug(f"TOR: {line}"),
+                init_msg_handler=on_init_msg,
                 timeout=300,
             )
             
-            # Connect to newly launched Tor
-            time.sleep(5)  # Give Tor time to start
+            # Connect as soon as Tor reports it has bootstrapped
+            if not bootstrapped.wait(timeout=60):
+                logger.warning("Tor did not report bootstrap completion, connecting anyway")
             self.controller = Controller.from_port(port=self.control_port)
             self.controller.authenticate()
             
@@ -131,7 +219,7 @@ class TorManager:
             if circuit_id:
                 logger.debug(f"Created initial circuit {circuit_id}")
     
-    def _create_circuit(self) -> Optional[str]:
+    def _create_circuit(self) -> str | None:
         """Create a new Tor circuit."""
         try:
             circuit_id = self.controller.new_circuit()
@@ -139,16 +227,19 @@ class TorManager:
             # Get circuit info
             circuit_info = self.controller.get_circuit(circuit_id)
             
+            created_at = time.monotonic()
             circuit = Circuit(
                 id=circuit_id,
                 state=CircuitState.FRESH,
-                created_at=time.time(),
+                created_at=created_at,
+                healthy_until=created_at + min(self.circuit_lifetime, MAX_CIRCUIT_AGE),
                 entry_node=circuit_info.path[0][0] if circuit_info.path else None,
                 exit_node=circuit_info.path[-1][0] if circuit_info.path else None,
             )
             
             self.circuits[circuit_id] = circuit
-            self.active_circuits.append(circuit_id)
+            self.active_circuits[circuit_id] = None
+            heapq.heappush(self._healthy_heap, (0, 0.0, circuit_id))
             
             return circuit_id
             
@@ -156,69 +247,85 @@ class TorManager:
             logger.error(f"Failed to create circuit: {e}")
             return None
     
-    def get_circuit(self, require_fresh: bool = False) -> Optional[Circuit]:
+    def get_circuit(self, require_fresh: bool = False) -> Circuit | None:
         """Get a healthy circuit for use."""
-        # Clean up dead circuits
-        self._cleanup_circuits()
+        now = time.monotonic()
         
-        # Find healthy circuit
-        for circuit_id in self.active_circuits:
+        # Retire expired circuits and degrade overused ones; only live
+        # circuits are scanned, dead ones are pruned from their own queue
+        for circuit_id in list(self.active_circuits):
             circuit = self.circuits[circuit_id]
+            if circuit.state == CircuitState.DEAD or circuit.age(now) > self.circuit_lifetime:
+                self._retire_circuit(circuit, now)
+            elif circuit.request_count > MAX_CIRCUIT_REQUESTS:
+                circuit.state = CircuitState.DEGRADED
+        self._prune_dead_circuits(now)
+        
+        # Take the least used healthy circuit off the heap
+        while self._healthy_heap:
+            request_count, last_used, circuit_id = self._healthy_heap[0]
+            circuit = self.circuits.get(circuit_id)
             
-            if circuit.is_healthy:
-                if require_fresh and circuit.request_count > 0:
-                    continue
-                    
-                circuit.request_count += 1
-                circuit.last_used = time.time()
-                circuit.state = CircuitState.ACTIVE
-                
-                return circuit
+            if (
+                circuit is None
+                or circuit.request_count != request_count
+                or (circuit.last_used or 0.0) != last_used
+                or not circuit.is_healthy(now)
+            ):
+                heapq.heappop(self._healthy_heap)
+                continue
+            
+            # Heap top is the least used circuit, so nothing fresher exists
+            if require_fresh and circuit.request_count > 0:
+                break
+            
+            heapq.heappop(self._healthy_heap)
+            circuit.state = CircuitState.ACTIVE
+            return self._use_circuit(circuit, now)
         
         # Create new circuit if none available
         if len(self.active_circuits) < self.max_circuits:
             circuit_id = self._create_circuit()
             if circuit_id:
-                circuit = self.circuits[circuit_id]
-                circuit.request_count = 1
-                circuit.last_used = time.time()
-                return circuit
+                return self._use_circuit(self.circuits[circuit_id], now)
         
         # Recycle oldest circuit
         if self.active_circuits:
-            oldest_id = min(
-                self.active_circuits,
-                key=lambda cid: self.circuits[cid].last_used or 0
-            )
-            circuit = self.circuits[oldest_id]
-            circuit.request_count += 1
-            circuit.last_used = time.time()
-            return circuit
+            oldest_id = next(iter(self.active_circuits))
+            return self._use_circuit(self.circuits[oldest_id], now)
         
         return None
     
-    def _cleanup_circuits(self) -> None:
-        """Remove dead or expired circuits."""
-        current_time = time.time()
-        dead_circuits = []
-        
-        for circuit_id, circuit in list(self.circuits.items()):
-            if circuit.state == CircuitState.DEAD:
-                dead_circuits.append(circuit_id)
-            elif circuit.age > self.circuit_lifetime:
-                circuit.state = CircuitState.DEAD
-                dead_circuits.append(circuit_id)
-            elif circuit.request_count > 100:
-                circuit.state = CircuitState.DEGRADED
+    def _use_circuit(self, circuit: Circuit, now: float) -> Circuit:
+        """Record a use of the circuit and requeue it on the heap."""
+        circuit.record_use(now)
+        if circuit.id in self.active_circuits:
+            self.active_circuits.move_to_end(circuit.id)
+        heapq.heappush(self._healthy_heap, (circuit.request_count, now, circuit.id))
+        return circuit
+    
+    def _retire_circuit(self, circuit: Circuit, now: float) -> None:
+        """Mark circuit dead and take it out of rotation."""
+        # Queue by membership, not died_at: Circuit.mark_dead() may already
+        # have been called directly, and the circuit still needs pruning
+        if circuit.id not in self.active_circuits:
+            return
+        circuit.mark_dead(now)
+        self._dead_circuits.append((now, circuit.id))
         
-        # Mark for removal but don't close circuits immediately
-        # (they might still be in use)
-        for circuit_id in dead_circuits:
-            if circuit_id in self.active_circuits:
-                self.active_circuits.remove(circuit_id)
+        # Don't close the circuit immediately (it might still be in use)
+        del self.active_circuits[circuit.id]
+    
+    def _prune_dead_circuits(self, now: float) -> None:
+        """Forget circuits that have been dead long enough to be unused."""
+        while self._dead_circuits and now - self._dead_circuits[0][0] > DEAD_CIRCUIT_RETENTION:
+            _, circuit_id = self._dead_circuits.popleft()
+            self.circuits.pop(circuit_id, None)
+            self._release_session(circuit_id)
+            self._retire_async_client(circuit_id)
     
     @contextmanager
-    def get_http_session(self, circuit: Optional[Circuit] = None) -> requests.Session:
+    def get_http_session(self, circuit: Circuit | None = None) -> requests.Session:
         """Get HTTP session configured for Tor with optional circuit isolation."""
         if not circuit:
             circuit = self.get_circuit()
@@ -228,29 +335,93 @@ class TorManager:
         # Create or reuse session for this circuit
         if circuit.id not in self._session_cache:
             session = requests.Session()
+            session.mount('http://', self._adapter)
+            session.mount('https://', self._adapter)
             
-            # Configure session to use Tor
-            session.proxies = {
-                'http': f'socks5h://127.0.0.1:{self.socks_port}',
-                'https': f'socks5h://127.0.0.1:{self.socks_port}',
-            }
+            # Configure session to use Tor; a distinct SOCKS username per
+            # circuit keeps its streams apart (Tor's IsolateSOCKSAuth)
+            proxy = self._session_proxy(circuit.id)
+            session.proxies = {'http': proxy, 'https': proxy}
             
             # Add headers to mimic browser
-            session.headers.update({
-                'User-Agent': self._get_random_user_agent(),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            })
+            session.headers['User-Agent'] = self._get_random_user_agent()
+            session.headers.update(self._DEFAULT_HEADERS)
             
             self._session_cache[circuit.id] = session
         
         yield self._session_cache[circuit.id]
     
-    def get_browser(self, circuit: Optional[Circuit] = None) -> webdriver.Firefox:
+    async def get_async_client(self, circuit: Circuit | None = None) -> httpx.AsyncClient:
+        """Get async HTTP/2 client routed through Tor for the given circuit.
+        
+        Requests on the same circuit share one connection per host, and
+        HTTPS hosts that negotiate HTTP/2 multiplex them over it.
+        """
+        import httpx
+        from httpx_socks import AsyncProxyTransport
+        
+        await self._close_retired_async_clients()
+        
+        if not circuit:
+            circuit = self.get_circuit()
+            if not circuit:
+                raise RuntimeError("No available circuits")
+        
+        if circuit.id not in self._async_clients:
+            transport = AsyncProxyTransport.from_url(
+                f'socks5://{self._socks_auth(circuit.id)}@127.0.0.1:{self.socks_port}',
+                rdns=True,
+                http2=True,
+            )
+            headers = dict(self._DEFAULT_HEADERS)
+            headers['User-Agent'] = self._get_random_user_agent()
+            
+            self._async_clients[circuit.id] = httpx.AsyncClient(
+                transport=transport,
+                headers=headers,
+            )
+        
+        return self._async_clients[circuit.id]
+    
+    async def aclose(self) -> None:
+        """Close all async HTTP clients."""
+        self._retired_async_clients.extend(self._async_clients.values())
+        self._async_clients.clear()
+        await self._close_retired_async_clients()
+    
+    def _retire_async_client(self, circuit_id: str) -> None:
+        """Queue circuit's async client for closing from async context."""
+        client = self._async_clients.pop(circuit_id, None)
+        if client is not None:
+            self._retired_async_clients.append(client)
+    
+    async def _close_retired_async_clients(self) -> None:
+        """Close async clients of circuits that are no longer used."""
+        while self._retired_async_clients:
+            await self._retired_async_clients.pop().aclose()
+    
+    @staticmethod
+    def _socks_auth(circuit_id: str) -> str:
+        """SOCKS credentials that isolate the circuit's streams."""
+        return f'circ{circuit_id}:x'
+    
+    def _session_proxy(self, circuit_id: str) -> str:
+        """Proxy URL of the circuit's requests session."""
+        return f'socks5h://{self._socks_auth(circuit_id)}@127.0.0.1:{self.socks_port}'
+    
+    def _release_session(self, circuit_id: str) -> None:
+        """Drop the circuit's session and close its proxy manager's pools."""
+        self._session_cache.pop(circuit_id, None)
+        manager = self._adapter.proxy_manager.pop(self._session_proxy(circuit_id), None)
+        if manager is not None:
+            manager.clear()
+    
+    def get_browser(self, circuit: Circuit | None = None) -> webdriver.Firefox:
         """Get Selenium browser configured for Tor."""
+        from selenium import webdriver
+        from selenium.webdriver.firefox.options import Options as FirefoxOptions
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        
         if not circuit:
             circuit = self.get_circuit()
             if not circuit:
@@ -278,20 +449,15 @@ class TorManager:
     
     def _get_random_user_agent(self) -> str:
         """Get random user agent from pool."""
-        # In production, load from file
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.1 Safari/605.1.15',
-            'Mozilla/5.0 (X11; Linux x86_64; rv:109.0) Gecko/20100101 Firefox/119.0',
-        ]
-        return random.choice(user_agents)
+        # Draw in batches from a private RNG instead of one global choice per call
+        if not self._ua_buf:
+            self._ua_buf.extend(self._rng.choices(_USER_AGENTS, k=_USER_AGENT_BATCH))
+        return self._ua_buf.popleft()
     
     def mark_circuit_dead(self, circuit_id: str) -> None:
         """Mark a circuit as dead (e.g., after timeout or error)."""
         if circuit_id in self.circuits:
-            self.circuits[circuit_id].state = CircuitState.DEAD
-            if circuit_id in self.active_circuits:
-                self.active_circuits.remove(circuit_id)
+            self._retire_circuit(self.circuits[circuit_id], time.monotonic())
     
     def rotate_all_circuits(self) -> None:
         """Rotate all circuits (emergency or scheduled)."""
@@ -301,30 +467,40 @@ class TorManager:
         for circuit_id in list(self.circuits.keys()):
             self.mark_circuit_dead(circuit_id)
         
-        # Clear session cache
-        self._session_cache.clear()
+        # Clear session caches and circuit heap
+        for circuit_id in list(self._session_cache):
+            self._release_session(circuit_id)
+        for circuit_id in list(self._async_clients):
+            self._retire_async_client(circuit_id)
+        self._healthy_heap.clear()
         
         # Create fresh circuits
         self._initialize_circuits()
     
-    def get_stats(self) -> Dict[str, Any]:
+    def get_stats(self) -> dict[str, Any]:
         """Get current Tor manager statistics."""
+        now = time.monotonic()
         return {
             'total_circuits': len(self.circuits),
             'active_circuits': len(self.active_circuits),
-            'healthy_circuits': sum(1 for c in self.circuits.values() if c.is_healthy),
+            'healthy_circuits': sum(1 for c in self.circuits.values() if c.is_healthy(now)),
             'sessions_cached': len(self._session_cache),
+            'async_clients_cached': len(self._async_clients),
         }
     
     def stop(self) -> None:
-        """Stop Tor manager and cleanup."""
+        """Stop Tor manager and cleanup.
+        
+        Async clients must be closed beforehand with ``await aclose()``.
+        """
         logger.info("Stopping Tor manager...")
         
         # Close all browser sessions
         # (Selenium sessions should be closed by their owners)
         
-        # Clear caches
+        # Clear caches and close pooled connections
         self._session_cache.clear()
+        self._adapter.close()
         
         # Stop Tor process if we started it
         if self._tor_process:
@@ -337,7 +513,7 @@ class TorManager:
 
 
 # Factory function for dependency injection
-def create_tor_manager(config: Dict[str, Any]) -> TorManager:
+def create_tor_manager(config: dict[str, Any]) -> TorManager:
     """Create TorManager from configuration."""
     tor_config = config.get('tor', {})
     
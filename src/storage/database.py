@@ -4,19 +4,66 @@ Database connection and repository pattern implementation.
 
 import asyncio
 import contextlib
-from typing import AsyncGenerator, Optional, List, Dict, Any
-from datetime import datetime, timedelta
-from sqlalchemy import select, update, delete, and_, or_, func
+import uuid
+from typing import AsyncGenerator, Optional, List, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import (
+    select, update, delete, and_, or_, func, inspect, cast, column, values, lambda_stmt, text,
+    literal_column, tuple_, event,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Session, selectinload, make_transient_to_detached
+import msgspec
 import redis.asyncio as redis
 
 from src.utils.logger import get_logger
 from src.utils.config import DatabaseConfig
-from .models import Base, Site, DiscoveryResult, Classification, SafetyCheck, CrawlJob, SystemMetrics
+from .models import (
+    Base, Site, site_search_document, utc_now, uuid7, DiscoveryResult, Classification,
+    SafetyCheck, CrawlJob, ContentHash, SystemMetrics,
+)
 
 logger = get_logger(__name__)
 
+# Site columns an upsert never overwrites
+_SITE_IMMUTABLE_COLUMNS = frozenset({'id', 'onion_address', 'first_seen'})
+
+# Seconds a site row stays in the Redis read-through cache
+SITE_CACHE_TTL = 3600
+
+# msgpack layout of a cached site row: every mapped column, in mapper order
+_CachedSite = msgspec.defstruct(
+    '_CachedSite',
+    [(attr.key, Optional[attr.columns[0].type.python_type], None) for attr in inspect(Site).column_attrs],
+    array_like=True,
+)
+
+
+def _site_address_key(onion_address: str) -> str:
+    return f"site:addr:{onion_address}"
+
+
+def _site_id_key(site_id: Any) -> str:
+    return f"site:id:{site_id}"
+
+
+# session.info keys: site cache entries to drop once the transaction commits,
+# and whether the transaction has written rows other sessions can't see yet
+_STALE_CACHE_KEYS = 'stale_site_cache_keys'
+_HAS_WRITES = 'has_uncommitted_writes'
+
+
+@event.listens_for(Session, 'after_flush')
+def _mark_flushed_writes(session, flush_context):
+    session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _clear_write_mark(session):
+    session.info.pop(_HAS_WRITES, None)
+
 
 class Database:
     """Database connection and operations."""
@@ -33,9 +80,27 @@ class Database:
         self.engine = create_async_engine(
             self.database_url,
             echo=False,  # Set to True for SQL debugging
-            pool_size=20,
-            max_overflow=10,
-            pool_pre_ping=True,
+            # A fixed pool near Postgres' throughput peak; past it, extra
+            # backends only add contention, so callers wait instead
+            pool_size=config.pool_size or 25,
+            max_overflow=0,
+            pool_timeout=5,
+            # No pre-ping: a SELECT 1 per checkout costs a round trip per
+            # session. Recycling plus keepalives retire dead connections instead.
+            pool_recycle=1800,
+            pool_pre_ping=False,
+            connect_args={
+                'statement_cache_size': 1024,
+                'prepared_statement_cache_size': 1024,
+                'server_settings': {
+                    # JIT compile time dwarfs the run time of short OLTP queries
+                    'jit': 'off',
+                    'application_name': 'arachne',
+                    'tcp_keepalives_idle': '60',
+                    'tcp_keepalives_interval': '10',
+                    'tcp_keepalives_count': '3',
+                },
+            },
         )
         
         self.async_session = async_sessionmaker(
@@ -48,22 +113,76 @@ class Database:
         self.redis: Optional[redis.Redis] = None
         
     async def connect(self):
-        """Connect to databases."""
-        # PostgreSQL
+        """Connect to databases; the schema is created separately by init_schema."""
+        async def connect_postgres():
+            # Opens the first pooled connection, so a bad DSN fails here
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        
+        async def connect_redis():
+            self.redis = redis.Redis(
+                host=self.config.redis_host,
+                port=self.config.redis_port,
+                db=self.config.redis_db,
+            )
+            await self.redis.ping()
+        
+        # The two handshakes are independent, so overlap them
+        await asyncio.gather(connect_postgres(), connect_redis())
+        
+        logger.info("Connected to PostgreSQL and Redis")
+    
+    async def init_schema(self):
+        """Create missing tables and upcoming crawl_jobs partitions."""
         async with self.engine.begin() as conn:
-            # Create tables if they don't exist
             await conn.run_sync(Base.metadata.create_all)
+        await self.ensure_crawl_job_partitions()
         
-        # Redis
-        self.redis = redis.Redis(
-            host=self.config.redis_host,
-            port=self.config.redis_port,
-            db=self.config.redis_db,
-            decode_responses=True,
-        )
-        await self.redis.ping()
+        logger.info("Database schema initialized")
+    
+    async def ensure_crawl_job_partitions(self, months_ahead: int = 2) -> None:
+        """Create missing monthly crawl_jobs partitions, moving their rows out of DEFAULT."""
+        # created_at is naive UTC
+        month = datetime.now(timezone.utc).date().replace(day=1)
+        months = set()
+        for _ in range(months_ahead + 1):
+            months.add(month)
+            month = (month + timedelta(days=32)).replace(day=1)
         
-        logger.info("Connected to PostgreSQL and Redis")
+        async with self.engine.begin() as conn:
+            if await conn.scalar(text("SELECT to_regclass('crawl_jobs_default')")) is None:
+                return  # schema not created yet
+            # Serialises processes starting together; released at commit
+            await conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('crawl_jobs_partitions'))"))
+            existing = set(await conn.scalars(text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'crawl_jobs'::regclass"
+            )))
+            # DEFAULT is normally empty, so this scan is cheap
+            months.update(await conn.scalars(text(
+                "SELECT DISTINCT date_trunc('month', created_at)::date FROM crawl_jobs_default"
+            )))
+            for month in sorted(months):
+                name = f"crawl_jobs_p{month:%Y%m}"
+                if name not in existing:
+                    await self._create_crawl_job_partition(conn, name, month)
+    
+    @staticmethod
+    async def _create_crawl_job_partition(conn, name: str, month) -> None:
+        """Create one month's partition, move its rows out of DEFAULT, then attach it."""
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        await conn.execute(text(f"CREATE TABLE {name} (LIKE crawl_jobs INCLUDING DEFAULTS)"))
+        await conn.execute(text(
+            f"WITH moved AS ("
+            f"DELETE FROM crawl_jobs_default "
+            f"WHERE created_at >= '{month}' AND created_at < '{next_month}' RETURNING *"
+            f") INSERT INTO {name} SELECT * FROM moved"
+        ))
+        await conn.execute(text(
+            f"ALTER TABLE crawl_jobs ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{month}') TO ('{next_month}')"
+        ))
+        logger.info(f"Created crawl_jobs partition {name}")
     
     async def disconnect(self):
         """Disconnect from databases."""
@@ -74,16 +193,58 @@ class Database:
     
     @contextlib.asynccontextmanager
     async def get_session(self) -> AsyncGenerator[AsyncSession, None]:
-        """Get database session context manager."""
+        """Get database session context manager; drops written sites' cache entries after commit."""
         async with self.async_session() as session:
             try:
                 yield session
+                stale_keys = session.info.pop(_STALE_CACHE_KEYS, None)
                 await session.commit()
             except Exception:
                 await session.rollback()
                 raise
             finally:
                 await session.close()
+            if stale_keys and self.redis is not None:
+                try:
+                    await self.redis.delete(*stale_keys)
+                except redis.RedisError as e:
+                    # The write is committed; failing the caller would invite a retry
+                    logger.error(f"Failed to invalidate {len(stale_keys)} cached site entries: {e}")
+
+
+# Column order of the records bulk COPY paths build; timestamps are left
+# to their server defaults
+_DISCOVERY_COPY_COLUMNS = (
+    'id', 'site_id', 'source_url', 'discovery_method', 'confidence', 'raw_content_hash',
+)
+_CONTENT_HASH_COPY_COLUMNS = (
+    'id', 'site_id', 'hash_type', 'hash_value', 'algorithm', 'content_size', 'mime_type',
+)
+
+
+async def _copy_records(session: AsyncSession, model: Any, columns: Tuple[str, ...], records: List[tuple]) -> None:
+    """Stream records into model's table with binary COPY, inside the session's transaction."""
+    if not records:
+        return
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    driver = raw.driver_connection
+    # The asyncpg adapter only sends BEGIN on the first statement it runs;
+    # COPY bypasses it, so on a fresh session it would autocommit.
+    if not driver.is_in_transaction():
+        await connection.exec_driver_sql("SELECT 1")
+    await driver.copy_records_to_table(
+        model.__tablename__,
+        records=records,
+        columns=list(columns),
+    )
+
+
+def _apply_loads(stmt, model: Any, loads: Tuple[str, ...]):
+    """Eager-load the named relationships of model in one extra SELECT each."""
+    for name in loads:
+        stmt = stmt.options(selectinload(getattr(model, name)))
+    return stmt
 
 
 class SiteRepository:
@@ -92,57 +253,203 @@ class SiteRepository:
     def __init__(self, db: Database):
         self.db = db
     
+    @staticmethod
+    def _upsert_statement(rows: List[Dict[str, Any]]):
+        """Upsert rows on onion_address, keeping existing values where a row has None."""
+        stmt = pg_insert(Site).values(rows)
+        # Rows are keyed by attribute name, which differs from the column
+        # name for meta ('metadata')
+        columns = Site.__mapper__.c
+        update_cols = {
+            columns[key].name: func.coalesce(stmt.excluded[columns[key].name], columns[key])
+            for key in rows[0]
+            if key not in _SITE_IMMUTABLE_COLUMNS
+        }
+        update_cols['last_checked'] = utc_now()
+        return stmt.on_conflict_do_update(index_elements=['onion_address'], set_=update_cols)
+    
+    async def bulk_upsert_sites(
+        self,
+        session: AsyncSession,
+        rows: List[Dict[str, Any]],
+    ) -> List[Tuple[Any, str]]:
+        """Create or update many sites; returns (id, onion_address) per site."""
+        # One row per address: Postgres rejects a statement that hits the
+        # same conflict target twice
+        merged: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            merged.setdefault(row['onion_address'], {}).update(row)
+        
+        # Multi-row VALUES needs identical keys, so batch by key set; a
+        # crawler batch normally has a single shape and one statement
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in merged.values():
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+        
+        upserted = []
+        for group in groups.values():
+            stmt = self._upsert_statement(group).returning(Site.id, Site.onion_address)
+            result = await session.execute(stmt)
+            upserted.extend((row.id, row.onion_address) for row in result)
+        self._mark_stale(session, upserted)
+        return upserted
+    
     async def create_or_update_site(self, session: AsyncSession, onion_address: str, **kwargs) -> Site:
         """Create or update a site."""
-        # Check if site exists
-        stmt = select(Site).where(Site.onion_address == onion_address)
-        result = await session.execute(stmt)
-        existing = result.scalar_one_or_none()
-        
-        if existing:
-            # Update existing site
-            for key, value in kwargs.items():
-                if hasattr(existing, key) and value is not None:
-                    setattr(existing, key, value)
-            existing.last_checked = datetime.utcnow()
-            return existing
-        
-        # Create new site
-        site = Site(onion_address=onion_address, **kwargs)
-        session.add(site)
-        await session.flush()
+        row = {'onion_address': onion_address, **kwargs}
+        stmt = self._upsert_statement([row]).returning(Site)
+        result = await session.execute(stmt, execution_options={'populate_existing': True})
+        site = result.scalar_one()
+        self._mark_stale(session, [(site.id, site.onion_address)])
         return site
     
-    async def get_site(self, session: AsyncSession, site_id: str) -> Optional[Site]:
-        """Get site by ID."""
-        stmt = select(Site).where(Site.id == site_id)
+    async def get_site(
+        self,
+        session: AsyncSession,
+        site_id: str,
+        *,
+        loads: Tuple[str, ...] = (),
+    ) -> Optional[Site]:
+        """Get site by ID, eager-loading the relationships named in loads."""
+        if loads:
+            # Cached rows carry no relationships
+            stmt = _apply_loads(select(Site).where(Site.id == site_id), Site, loads)
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
+        
+        cached = await self._get_cached(session, _site_id_key(site_id))
+        if cached is not None:
+            return cached
+        
+        stmt = lambda_stmt(lambda: select(Site).where(Site.id == site_id))
         result = await session.execute(stmt)
-        return result.scalar_one_or_none()
+        site = result.scalar_one_or_none()
+        if site is not None:
+            await self._put_cached(session, site)
+        return site
     
     async def get_site_by_address(self, session: AsyncSession, onion_address: str) -> Optional[Site]:
         """Get site by onion address."""
-        stmt = select(Site).where(Site.onion_address == onion_address)
+        cached = await self._get_cached(session, _site_address_key(onion_address))
+        if cached is not None:
+            return cached
+        
+        stmt = lambda_stmt(lambda: select(Site).where(Site.onion_address == onion_address))
         result = await session.execute(stmt)
-        return result.scalar_one_or_none()
+        site = result.scalar_one_or_none()
+        if site is not None:
+            await self._put_cached(session, site)
+        return site
+    
+    async def invalidate_cached_site(self, site_id: Any) -> None:
+        """Drop a site's cached row after writing to it outside this repository."""
+        if self.db.redis is None:
+            return
+        # The id entry holds the full row, which names the address entry to drop
+        blob = await self.db.redis.getdel(_site_id_key(site_id))
+        if blob is None:
+            return
+        try:
+            onion_address = msgspec.msgpack.decode(blob, type=_CachedSite).onion_address
+        except msgspec.DecodeError:
+            return
+        await self.db.redis.delete(_site_address_key(onion_address))
+    
+    def _cache_usable(self, session: AsyncSession) -> bool:
+        """Whether session may use the site cache: not once it has uncommitted writes."""
+        if self.db.redis is None:
+            return False
+        return not (
+            session.info.get(_HAS_WRITES)
+            or session.new or session.dirty or session.deleted
+        )
+    
+    async def _get_cached(self, session: AsyncSession, key: str) -> Optional[Site]:
+        """Cached site for key, attached to session, or None on a miss."""
+        if not self._cache_usable(session):
+            return None
+        try:
+            blob = await self.db.redis.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Site cache read failed, using the database: {e}")
+            return None
+        if blob is None:
+            return None
+        try:
+            cached = msgspec.msgpack.decode(blob, type=_CachedSite)
+        except msgspec.DecodeError:
+            # Written under an older column layout
+            return None
+        
+        site = Site(**msgspec.structs.asdict(cached))
+        make_transient_to_detached(site)
+        # load=False attaches the row as persistent without a SELECT
+        return await session.merge(site, load=False)
+    
+    async def _put_cached(self, session: AsyncSession, site: Site) -> None:
+        """Cache a site row, read through session, under its address and id."""
+        if not self._cache_usable(session):
+            return
+        blob = msgspec.msgpack.encode(
+            _CachedSite(**{name: getattr(site, name) for name in _CachedSite.__struct_fields__})
+        )
+        try:
+            async with self.db.redis.pipeline(transaction=False) as pipe:
+                pipe.set(_site_address_key(site.onion_address), blob, ex=SITE_CACHE_TTL)
+                pipe.set(_site_id_key(site.id), blob, ex=SITE_CACHE_TTL)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Site cache fill failed: {e}")
     
-    async def get_pending_sites(self, session: AsyncSession, limit: int = 100) -> List[Site]:
-        """Get sites that need to be crawled."""
+    @staticmethod
+    def _mark_stale(session: AsyncSession, sites: List[Tuple[Any, str]]) -> None:
+        """Queue cache keys of written (id, onion_address) pairs for dropping at commit."""
+        session.info[_HAS_WRITES] = True
+        keys = session.info.setdefault(_STALE_CACHE_KEYS, set())
+        for site_id, onion_address in sites:
+            keys.add(_site_id_key(site_id))
+            keys.add(_site_address_key(onion_address))
+    
+    async def get_pending_sites(
+        self,
+        session: AsyncSession,
+        limit: int = 100,
+        after: Optional[Tuple[Optional[datetime], uuid.UUID]] = None,
+    ) -> Tuple[List[Site], Optional[Tuple[Optional[datetime], uuid.UUID]]]:
+        """Get sites that need to be crawled, and the (last_checked, id) cursor to pass as after."""
         stmt = (
             select(Site)
             .where(
                 or_(
                     Site.last_checked.is_(None),
-                    Site.last_checked < datetime.utcnow() - timedelta(hours=24)
+                    Site.last_checked < utc_now() - timedelta(hours=24)
                 )
             )
-            .where(Site.status.in_(['discovered', 'active']))
+            # Inlined so a generic plan can still prove idx_sites_pending's predicate
+            .where(Site.status.in_([literal_column("'discovered'"), literal_column("'active'")]))
             .where(Site.is_honeypot.is_(False))
             .where(Site.is_illegal.is_(False))
-            .order_by(Site.last_checked.asc().nullsfirst())
+            .order_by(Site.last_checked.asc().nullsfirst(), Site.id.asc())
             .limit(limit)
         )
+        # Keyset instead of OFFSET: the partial index range scan starts at the cursor
+        if after is not None:
+            after_checked, after_id = after
+            if after_checked is None:
+                stmt = stmt.where(
+                    or_(
+                        and_(Site.last_checked.is_(None), Site.id > after_id),
+                        Site.last_checked.is_not(None),
+                    )
+                )
+            else:
+                stmt = stmt.where(tuple_(Site.last_checked, Site.id) > tuple_(after_checked, after_id))
+        
         result = await session.execute(stmt)
-        return list(result.scalars().all())
+        sites = list(result.scalars().all())
+        if not sites:
+            return sites, after
+        return sites, (sites[-1].last_checked, sites[-1].id)
     
     async def search_sites(
         self, 
@@ -152,21 +459,19 @@ class SiteRepository:
         status: Optional[str] = None,
         language: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        *,
+        loads: Tuple[str, ...] = (),
     ) -> List[Site]:
-        """Search sites with filters."""
-        stmt = select(Site)
+        """Search sites with filters, eager-loading the relationships named in loads."""
+        stmt = _apply_loads(select(Site), Site, loads)
         
         # Apply filters
         filters = []
         if query:
-            filters.append(
-                or_(
-                    Site.title.ilike(f"%{query}%"),
-                    Site.description.ilike(f"%{query}%"),
-                    Site.onion_address.ilike(f"%{query}%")
-                )
-            )
+            # One ILIKE over the indexed document instead of three unindexable ones
+            document = site_search_document(Site.title, Site.description, Site.onion_address)
+            filters.append(document.ilike(f"%{query}%"))
         if category:
             filters.append(Site.category == category)
         if status:
@@ -197,9 +502,9 @@ class DiscoveryRepository:
         discovery_method: str,
         source_url: Optional[str] = None,
         confidence: float = 0.0,
-        raw_content_hash: Optional[str] = None
+        raw_content_hash: Optional[bytes] = None
     ) -> DiscoveryResult:
-        """Create a discovery result."""
+        """Create a discovery result; raw_content_hash is a raw SHA256 digest."""
         result = DiscoveryResult(
             site_id=site_id,
             source_url=source_url,
@@ -210,6 +515,61 @@ class DiscoveryRepository:
         session.add(result)
         await session.flush()
         return result
+    
+    async def bulk_insert_discoveries(
+        self,
+        session: AsyncSession,
+        discoveries: List[Dict[str, Any]],
+    ) -> List[uuid.UUID]:
+        """Insert many discovery results with COPY; returns their ids."""
+        records = [
+            (
+                uuid7(),
+                item['site_id'],
+                item.get('source_url'),
+                item['discovery_method'],
+                item.get('confidence', 0.0),
+                item.get('raw_content_hash'),
+            )
+            for item in discoveries
+        ]
+        await _copy_records(session, DiscoveryResult, _DISCOVERY_COPY_COLUMNS, records)
+        return [record[0] for record in records]
+
+
+class ContentHashRepository:
+    """Repository for content hash operations."""
+    
+    def __init__(self, db: Database):
+        self.db = db
+    
+    async def bulk_insert_content_hashes(
+        self,
+        session: AsyncSession,
+        hashes: List[Dict[str, Any]],
+    ) -> List[uuid.UUID]:
+        """Insert many content hashes with COPY; returns their ids."""
+        records = [
+            (
+                uuid7(),
+                item['site_id'],
+                item['hash_type'],
+                item['hash_value'],
+                item['algorithm'],
+                item.get('content_size'),
+                item.get('mime_type'),
+            )
+            for item in hashes
+        ]
+        await _copy_records(session, ContentHash, _CONTENT_HASH_COPY_COLUMNS, records)
+        return [record[0] for record in records]
+
+
+# Shared default for CrawlJob.meta, saving a dict per job; never mutate it
+_EMPTY_META: Dict[str, Any] = {}
+
+# Columns bulk_update_job_status carries per job, after the id
+_JOB_STATUS_FIELDS = ('status', 'started_at', 'completed_at', 'error_message', 'discovered_links')
 
 
 class CrawlJobRepository:
@@ -225,7 +585,7 @@ class CrawlJobRepository:
         url: str,
         priority: int = 0,
         max_depth: int = 1,
-        metadata: Optional[Dict[str, Any]] = None
+        meta: Optional[Dict[str, Any]] = None
     ) -> CrawlJob:
         """Create a crawl job."""
         job = CrawlJob(
@@ -233,8 +593,7 @@ class CrawlJobRepository:
             url=url,
             priority=priority,
             max_depth=max_depth,
-            metadata=metadata or {},
-            scheduled_for=datetime.utcnow(),
+            meta=meta or _EMPTY_META,
         )
         session.add(job)
         await session.flush()
@@ -242,10 +601,11 @@ class CrawlJobRepository:
     
     async def get_pending_jobs(self, session: AsyncSession, limit: int = 10) -> List[CrawlJob]:
         """Get pending crawl jobs."""
-        stmt = (
-            select(CrawlJob)
-            .where(CrawlJob.status == 'pending')
-            .where(CrawlJob.scheduled_for <= datetime.utcnow())
+        stmt = lambda_stmt(
+            lambda: select(CrawlJob)
+            # Inlined so a generic plan can still prove idx_crawljobs_pending's predicate
+            .where(CrawlJob.status == literal_column("'pending'"))
+            .where(CrawlJob.scheduled_for <= utc_now())
             .order_by(CrawlJob.priority.desc(), CrawlJob.created_at.asc())
             .limit(limit)
         )
@@ -261,19 +621,68 @@ class CrawlJobRepository:
         discovered_links: Optional[int] = None
     ) -> None:
         """Update crawl job status."""
+        update_data = self._status_changes(status, error_message, discovered_links)
+        stmt = update(CrawlJob).where(CrawlJob.id == job_id).values(**update_data)
+        await session.execute(stmt)
+    
+    async def bulk_update_job_status(self, session: AsyncSession, updates: List[Dict[str, Any]]) -> None:
+        """Update many crawl jobs (dicts of update_job_status' arguments) in one statement."""
+        if not updates:
+            return
+        
+        columns = CrawlJob.__table__.c
+        rows = []
+        for item in updates:
+            changes = self._status_changes(
+                item['status'], item.get('error_message'), item.get('discovered_links')
+            )
+            rows.append((item['job_id'], *(changes.get(name) for name in _JOB_STATUS_FIELDS)))
+        
+        # UPDATE ... FROM (VALUES ...) AS v: one round trip and one plan for the batch
+        v = values(
+            column('id', columns.id.type),
+            *(column(name, columns[name].type) for name in _JOB_STATUS_FIELDS),
+            name='v',
+        ).data(rows)
+        
+        # Columns that are NULL in every row come back as text, hence the casts;
+        # coalesce keeps fields a row leaves unset, like the single-row update
+        stmt = (
+            update(CrawlJob)
+            .where(CrawlJob.id == v.c.id)
+            .values(
+                status=v.c.status,
+                **{
+                    name: func.coalesce(cast(v.c[name], columns[name].type), columns[name])
+                    for name in _JOB_STATUS_FIELDS[1:]
+                },
+            )
+        )
+        await session.execute(stmt)
+    
+    @staticmethod
+    def _status_changes(
+        status: str,
+        error_message: Optional[str] = None,
+        discovered_links: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Columns a status transition writes."""
         update_data = {"status": status}
         
         if status == 'running':
-            update_data["started_at"] = datetime.utcnow()
+            update_data["started_at"] = utc_now()
         elif status in ['completed', 'failed']:
-            update_data["completed_at"] = datetime.utcnow()
+            update_data["completed_at"] = utc_now()
             if error_message:
                 update_data["error_message"] = error_message
             if discovered_links is not None:
                 update_data["discovered_links"] = discovered_links
         
-        stmt = update(CrawlJob).where(CrawlJob.id == job_id).values(**update_data)
-        await session.execute(stmt)
+        return update_data
+
+
+# Seconds a queued job blob is kept; only reaps blobs orphaned by a lost id
+JOB_TTL = 86400
 
 
 class RedisQueue:
@@ -285,43 +694,49 @@ class RedisQueue:
     
     async def push_job(self, job_data: Dict[str, Any], priority: int = 0) -> str:
         """Push a job to the queue with priority."""
-        job_id = str(uuid.uuid4())
-        job_data["id"] = job_id
-        job_data["priority"] = priority
-        job_data["timestamp"] = datetime.utcnow().isoformat()
-        
-        # Use sorted set for priority queue
-        await self.redis.zadd(
-            self.queue_name,
-            {job_id: priority}
-        )
+        job_ids = await self.push_jobs([(job_data, priority)])
+        return job_ids[0]
+    
+    async def push_jobs(self, jobs: List[Tuple[Dict[str, Any], int]]) -> List[str]:
+        """Push (job_data, priority) pairs in one round trip, stamped with one timestamp."""
+        timestamp = datetime.now(timezone.utc)
+        job_ids = []
         
-        # Store job data
-        await self.redis.hset(
-            f"job:{job_id}",
-            mapping=job_data
-        )
+        # A plain pipeline is enough: each blob's SET is sent before its
+        # ZADD, so a consumer never pops an id whose data is missing
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for job_data, priority in jobs:
+                job_id = str(uuid.uuid4())
+                job_data["id"] = job_id
+                job_data["priority"] = priority
+                job_data["timestamp"] = timestamp
+                
+                # Store job data as one msgpack blob; the TTL reaps it if its id is lost
+                pipe.set(f"job:{job_id}", msgspec.msgpack.encode(job_data), ex=JOB_TTL)
+                # Use sorted set for priority queue
+                pipe.zadd(self.queue_name, {job_id: priority})
+                job_ids.append(job_id)
+            await pipe.execute()
         
-        return job_id
+        return job_ids
     
-    async def pop_job(self) -> Optional[Dict[str, Any]]:
-        """Pop highest priority job from queue."""
-        # Get highest priority job (lowest score = highest priority)
-        job_ids = await self.redis.zrange(self.queue_name, 0, 0)
+    async def pop_job(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+        """Pop highest priority job, waiting up to timeout seconds for one."""
+        # Get highest priority job (lowest score = highest priority); BZPOPMIN
+        # hands each id to exactly one waiting worker
+        result = await self.redis.bzpopmin(self.queue_name, timeout=timeout)
         
-        if not job_ids:
+        if not result:
             return None
         
-        job_id = job_ids[0]
-        
-        # Get job data
-        job_data = await self.redis.hgetall(f"job:{job_id}")
+        job_id = result[1].decode()
+        blob = await self.redis.getdel(f"job:{job_id}")
         
-        # Remove from queue
-        await self.redis.zrem(self.queue_name, job_id)
-        await self.redis.delete(f"job:{job_id}")
+        if blob is None:
+            logger.warning(f"Job {job_id} expired before it was popped")
+            return None
         
-        return job_data
+        return msgspec.msgpack.decode(blob)
     
     async def get_queue_length(self) -> int:
         """Get number of jobs in queue."""
@@ -334,3 +749,27 @@ async def create_database(config: DatabaseConfig) -> Database:
     db = Database(config)
     await db.connect()
     return db
+
+
+def init_database(config: DatabaseConfig) -> None:
+    """Create the database schema; used by `arachne init-db`."""
+    async def run():
+        db = Database(config)
+        try:
+            await db.init_schema()
+        finally:
+            await db.engine.dispose()
+    
+    asyncio.run(run())
+
+
+def maintain_database(config: DatabaseConfig) -> None:
+    """Keep crawl_jobs partitions ahead of time; used by `arachne maintain-db` (e.g. from cron)."""
+    async def run():
+        db = Database(config)
+        try:
+            await db.ensure_crawl_job_partitions()
+        finally:
+            await db.engine.dispose()
+    
+    asyncio.run(run())
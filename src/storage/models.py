@@ -2,27 +2,70 @@
 SQLAlchemy models for Arachne database.
 """
 
-from datetime import datetime
 from typing import Optional, List, Dict, Any
 from sqlalchemy import (
     Column, Integer, String, Boolean, Float, 
-    DateTime, JSON, Text, ForeignKey, Enum, UniqueConstraint
+    DateTime, JSON, Text, LargeBinary, ForeignKey, Enum, UniqueConstraint, Index, text,
+    DDL, event, func, literal_column
 )
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.dialects.postgresql import JSONB
+import os
+import time
 import uuid
 
 Base = declarative_base()
 
 
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7) for primary keys.
+    
+    A 48-bit millisecond timestamp leads, so new rows append to the right
+    edge of the primary key index instead of landing on random pages the
+    way uuid4 does.
+    """
+    unix_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    value = (unix_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76                          # version
+    value |= (rand >> 62 & 0xFFF) << 64         # rand_a
+    value |= 0b10 << 62                         # variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF       # rand_b
+    return uuid.UUID(int=value)
+
+
+def utc_now():
+    """Current UTC time as a naive timestamp, evaluated by Postgres.
+    
+    Used as the server default for creation timestamps so they come from
+    one clock and are not built and bound per row on the client.
+    """
+    return func.timezone('utc', func.now())
+
+
+def site_search_document(title, description, onion_address):
+    """Text matched by site search.
+    
+    idx_sites_search_trgm is built on this exact expression, so queries must
+    use it too for the planner to match the index. Literals are inlined
+    rather than bound for the same reason.
+    """
+    space = literal_column("' '")
+    return (
+        func.coalesce(title, literal_column("''")) + space
+        + func.coalesce(description, literal_column("''")) + space
+        + onion_address
+    )
+
+
 class Site(Base):
     """Dark web site entity."""
     __tablename__ = 'sites'
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     onion_address = Column(String(56), unique=True, nullable=False, index=True)
-    first_seen = Column(DateTime, default=datetime.utcnow, nullable=False)
+    first_seen = Column(DateTime, server_default=utc_now(), nullable=False)
     last_checked = Column(DateTime)
     last_changed = Column(DateTime)
     
@@ -44,7 +87,7 @@ class Site(Base):
     # Content info
     language = Column(String(10))
     title = Column(Text)
-    title_hash = Column(String(64))  # SHA256 of title for deduplication
+    title_hash = Column(LargeBinary(32))  # SHA256 digest of title for deduplication
     description = Column(Text)
     
     # Safety flags
@@ -54,29 +97,49 @@ class Site(Base):
     
     # Metadata
     tags = Column(ARRAY(String))
-    metadata = Column(JSONB)
+    meta = Column('metadata', JSONB)  # 'metadata' is reserved by declarative
     
     # Relationships
-    discovery_results = relationship("DiscoveryResult", back_populates="site", cascade="all, delete-orphan")
-    classifications = relationship("Classification", back_populates="site", cascade="all, delete-orphan")
-    safety_checks = relationship("SafetyCheck", back_populates="site", cascade="all, delete-orphan")
-    crawl_jobs = relationship("CrawlJob", back_populates="site", cascade="all, delete-orphan")
+    discovery_results = relationship("DiscoveryResult", back_populates="site", cascade="all, delete-orphan", lazy='raise_on_sql')
+    classifications = relationship("Classification", back_populates="site", cascade="all, delete-orphan", lazy='raise_on_sql')
+    safety_checks = relationship("SafetyCheck", back_populates="site", cascade="all, delete-orphan", lazy='raise_on_sql')
+    crawl_jobs = relationship("CrawlJob", back_populates="site", cascade="all, delete-orphan", lazy='raise_on_sql')
     
     __table_args__ = (
         UniqueConstraint('title_hash', 'language', name='uq_title_language'),
-        {'postgresql_partition_by': 'HASH(onion_address)'}
+        # Only crawl-eligible rows, pre-sorted for get_pending_sites
+        Index(
+            'idx_sites_pending',
+            last_checked.asc().nullsfirst(),
+            id,
+            postgresql_where=text(
+                "status IN ('discovered', 'active') AND is_honeypot IS false AND is_illegal IS false"
+            ),
+            postgresql_include=['onion_address'],
+        ),
+        # Trigram GIN index so substring search is an index lookup (needs pg_trgm)
+        Index(
+            'idx_sites_search_trgm',
+            site_search_document(title, description, onion_address).label('search_document'),
+            postgresql_using='gin',
+            postgresql_ops={'search_document': 'gin_trgm_ops'},
+        ),
     )
     
     def __repr__(self):
         return f"<Site(onion_address={self.onion_address}, status={self.status})>"
 
 
+# The trigram index above needs the extension before the table is created
+event.listen(Site.__table__, 'before_create', DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
 class DiscoveryResult(Base):
     """Result of discovering a site."""
     __tablename__ = 'discovery_results'
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    site_id = Column(UUID(as_uuid=True), ForeignKey('sites.id'), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    site_id = Column(UUID(as_uuid=True), ForeignKey('sites.id'), nullable=False)
     
     # Discovery info
     source_url = Column(Text)
@@ -87,22 +150,27 @@ class DiscoveryResult(Base):
     
     # Metrics
     confidence = Column(Float, default=0.0)
-    raw_content_hash = Column(String(64))  # SHA256 of raw content
+    raw_content_hash = Column(LargeBinary(32))  # SHA256 digest of raw content
     processing_time = Column(Float)
     
     # Timestamps
-    discovered_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    discovered_at = Column(DateTime, server_default=utc_now(), nullable=False)
     
     # Relationship
-    site = relationship("Site", back_populates="discovery_results")
+    site = relationship("Site", back_populates="discovery_results", lazy='raise_on_sql')
+    
+    __table_args__ = (
+        # Latest results for a site; also serves plain site_id lookups
+        Index('idx_discovery_site_time', site_id, discovered_at.desc()),
+    )
 
 
 class Classification(Base):
     """Classification result for a site."""
     __tablename__ = 'classifications'
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    site_id = Column(UUID(as_uuid=True), ForeignKey('sites.id'), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    site_id = Column(UUID(as_uuid=True), ForeignKey('sites.id'), nullable=False)
     
     # Classification
     category = Column(
@@ -123,18 +191,24 @@ class Classification(Base):
     features = Column(JSONB)
     
     # Timestamps
-    classified_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    classified_at = Column(DateTime, server_default=utc_now(), nullable=False)
     
     # Relationship
-    site = relationship("Site", back_populates="classifications")
+    site = relationship("Site", back_populates="classifications", lazy='raise_on_sql')
+    
+    __table_args__ = (
+        # Newest classifications for a site first; the site_id prefix
+        # covers plain site_id lookups too
+        Index('idx_classifications_site_time', site_id, classified_at.desc()),
+    )
 
 
 class SafetyCheck(Base):
     """Safety check result for a site."""
     __tablename__ = 'safety_checks'
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    site_id = Column(UUID(as_uuid=True), ForeignKey('sites.id'), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    site_id = Column(UUID(as_uuid=True), ForeignKey('sites.id'), nullable=False)
     
     # Result
     is_safe = Column(Boolean, nullable=False)
@@ -149,21 +223,26 @@ class SafetyCheck(Base):
     
     # Metadata
     filter_version = Column(String(50))
-    checked_content_hash = Column(String(64))
+    checked_content_hash = Column(LargeBinary(32))  # SHA256 digest
     
     # Timestamps
-    checked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    checked_at = Column(DateTime, server_default=utc_now(), nullable=False)
     
     # Relationship
-    site = relationship("Site", back_populates="safety_checks")
+    site = relationship("Site", back_populates="safety_checks", lazy='raise_on_sql')
+    
+    __table_args__ = (
+        # Most recent safety checks per site
+        Index('idx_safety_site_time', site_id, checked_at.desc()),
+    )
 
 
 class CrawlJob(Base):
     """Job for crawling a site."""
     __tablename__ = 'crawl_jobs'
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    site_id = Column(UUID(as_uuid=True), ForeignKey('sites.id'), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    site_id = Column(UUID(as_uuid=True), ForeignKey('sites.id'), nullable=False)
     
     # Job info
     url = Column(Text, nullable=False)
@@ -183,24 +262,47 @@ class CrawlJob(Base):
     error_message = Column(Text)
     discovered_links = Column(Integer, default=0)
     
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    scheduled_for = Column(DateTime)
+    # Timestamps; created_at is the partition key, so it joins the primary key
+    created_at = Column(DateTime, server_default=utc_now(), primary_key=True)
+    scheduled_for = Column(DateTime, server_default=utc_now())
     started_at = Column(DateTime)
     completed_at = Column(DateTime)
     
     # Metadata
-    metadata = Column(JSONB)
+    meta = Column('metadata', JSONB)  # 'metadata' is reserved by declarative
     
     # Relationship
-    site = relationship("Site", back_populates="crawl_jobs")
+    site = relationship("Site", back_populates="crawl_jobs", lazy='raise_on_sql')
+    
+    __table_args__ = (
+        # Recent jobs for a site
+        Index('idx_crawljobs_site_time', site_id, created_at.desc()),
+        # Only live work, in get_pending_jobs order; stays small however
+        # many finished jobs accumulate
+        Index(
+            'idx_crawljobs_pending',
+            priority.desc(),
+            created_at.asc(),
+            postgresql_where=text("status = 'pending'"),
+            postgresql_include=['scheduled_for'],
+        ),
+        # Monthly partitions are created by Database.ensure_crawl_job_partitions
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+
+# Catches rows outside the monthly partitions so inserts never fail;
+# ensure_crawl_job_partitions later moves them into a partition of their own
+event.listen(CrawlJob.__table__, 'after_create', DDL(
+    "CREATE TABLE IF NOT EXISTS crawl_jobs_default PARTITION OF crawl_jobs DEFAULT"
+))
 
 
 class ContentHash(Base):
     """Hashes of content for deduplication and safety checking."""
     __tablename__ = 'content_hashes'
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     site_id = Column(UUID(as_uuid=True), ForeignKey('sites.id'), nullable=False, index=True)
     
     # Hash info
@@ -216,7 +318,7 @@ class ContentHash(Base):
     mime_type = Column(String(100))
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, server_default=utc_now(), nullable=False)
     
     __table_args__ = (
         UniqueConstraint('site_id', 'hash_type', name='uq_site_hash_type'),
@@ -227,7 +329,7 @@ class SystemMetrics(Base):
     """System performance metrics."""
     __tablename__ = 'system_metrics'
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Metrics
     circuits_active = Column(Integer)
@@ -250,15 +352,39 @@ class SystemMetrics(Base):
     tor_traffic_read = Column(Integer)  # bytes
     tor_traffic_written = Column(Integer)  # bytes
     
-    # Timestamps
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    # Timestamps; part of the primary key because a hypertable's unique
+    # indexes must include its time column. No index=True: create_hypertable
+    # builds the time index itself.
+    timestamp = Column(DateTime, server_default=utc_now(), primary_key=True)
+
+
+# Store metrics as a TimescaleDB hypertable (1-day chunks, compressed after a
+# week) when the server has TimescaleDB installed; otherwise a plain table.
+# An installed but not preloaded extension fails to create, so that falls
+# back to the plain table too.
+event.listen(SystemMetrics.__table__, 'after_create', DDL("""
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb') THEN
+        BEGIN
+            CREATE EXTENSION IF NOT EXISTS timescaledb;
+            PERFORM create_hypertable('system_metrics', 'timestamp', chunk_time_interval => INTERVAL '1 day');
+            ALTER TABLE system_metrics SET (timescaledb.compress, timescaledb.compress_segmentby = '');
+            PERFORM add_compression_policy('system_metrics', INTERVAL '7 days');
+        EXCEPTION WHEN others THEN
+            RAISE NOTICE 'system_metrics stays a plain table: %%', SQLERRM;
+        END;
+    END IF;
+END
+$$;
+"""))
 
 
 class AuditLog(Base):
     """Audit log for all system actions."""
     __tablename__ = 'audit_logs'
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     
     # Action info
     component = Column(String(100), nullable=False)
@@ -278,9 +404,9 @@ class AuditLog(Base):
     error_message = Column(Text)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, server_default=utc_now(), nullable=False, index=True)
     
     __table_args__ = (
         Index('idx_audit_component_action', 'component', 'action'),
-        Index('idx_audit_timestamp_status', 'timestamp', 'status'),
+        Index('idx_audit_timestamp_status', 'created_at', 'status'),
     )
@@ -4,61 +4,244 @@ Configuration management for Arachne.
 
 import os
 import yaml
-from typing import Dict, Any, Optional
+import pickle
+import hashlib
+import stat
+import tempfile
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 from pathlib import Path
-from pydantic import BaseSettings, Field, validator
+import pydantic
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# libyaml's C parser when PyYAML was built with it (yaml.__with_libyaml__)
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
-class TorConfig(BaseSettings):
+
+class _Settings(BaseSettings):
+    """Shared settings behaviour.
+    
+    Fields are filled from YAML by name and from the environment (or .env)
+    by their upper-case alias; keys a section does not know are ignored.
+    """
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=False,
+        populate_by_name=True,
+        extra="ignore",
+    )
+
+
+class TorConfig(_Settings):
     """Tor configuration."""
-    socks_port: int = Field(9050, env="TOR_SOCKS_PORT")
-    control_port: int = Field(9051, env="TOR_CONTROL_PORT")
-    control_password: Optional[str] = Field(None, env="TOR_PASSWORD")
-    circuit_count: int = Field(10, env="TOR_CIRCUIT_COUNT")
-    circuit_lifetime_minutes: int = Field(10, env="TOR_CIRCUIT_LIFETIME")
-    max_requests_per_circuit: int = Field(100, env="TOR_MAX_REQUESTS")
-    entry_guards: int = Field(3, env="TOR_ENTRY_GUARDS")
+    socks_port: int = Field(9050, validation_alias="TOR_SOCKS_PORT")
+    control_port: int = Field(9051, validation_alias="TOR_CONTROL_PORT")
+    control_password: Optional[str] = Field(None, validation_alias="TOR_PASSWORD")
+    circuit_count: int = Field(10, validation_alias="TOR_CIRCUIT_COUNT")
+    circuit_lifetime_minutes: int = Field(10, validation_alias="TOR_CIRCUIT_LIFETIME")
+    max_requests_per_circuit: int = Field(100, validation_alias="TOR_MAX_REQUESTS")
+    entry_guards: int = Field(3, validation_alias="TOR_ENTRY_GUARDS")
 
 
-class DiscoveryConfig(BaseSettings):
+class DiscoveryConfig(_Settings):
     """Discovery configuration."""
-    max_depth: int = Field(3, env="DISCOVERY_MAX_DEPTH")
-    max_pages_per_site: int = Field(50, env="DISCOVERY_MAX_PAGES")
-    concurrent_requests: int = Field(5, env="DISCOVERY_CONCURRENT")
-    request_delay_min_ms: int = Field(1000, env="DISCOVERY_DELAY_MIN")
-    request_delay_max_ms: int = Field(5000, env="DISCOVERY_DELAY_MAX")
-    user_agents_file: str = Field("configs/user_agents.txt", env="USER_AGENTS_FILE")
+    max_depth: int = Field(3, validation_alias="DISCOVERY_MAX_DEPTH")
+    max_pages_per_site: int = Field(50, validation_alias="DISCOVERY_MAX_PAGES")
+    concurrent_requests: int = Field(5, validation_alias="DISCOVERY_CONCURRENT")
+    request_delay_min_ms: int = Field(1000, validation_alias="DISCOVERY_DELAY_MIN")
+    request_delay_max_ms: int = Field(5000, validation_alias="DISCOVERY_DELAY_MAX")
+    user_agents_file: str = Field("configs/user_agents.txt", validation_alias="USER_AGENTS_FILE")
+
+
+class SafetyConfig(_Settings):
+    """Safety configuration."""
+    max_content_size_mb: int = Field(10, validation_alias="SAFETY_MAX_CONTENT_SIZE_MB")
+    image_filtering: bool = Field(True, validation_alias="SAFETY_IMAGE_FILTERING")
+    illegal_content_filter: str = Field("strict", validation_alias="ILLEGAL_CONTENT_FILTER")
+    air_gap_mode: bool = Field(True, validation_alias="AIR_GAP_MODE")
+
+
+class DatabaseConfig(_Settings):
+    """Database configuration."""
+    postgres_host: str = Field("localhost", validation_alias="POSTGRES_HOST")
+    postgres_port: int = Field(5432, validation_alias="POSTGRES_PORT")
+    postgres_db: str = Field("arachne", validation_alias="POSTGRES_DB")
+    postgres_user: str = Field("arachne", validation_alias="POSTGRES_USER")
+    postgres_password: str = Field("", validation_alias="POSTGRES_PASSWORD")
+    pool_size: int = Field(25, validation_alias="POSTGRES_POOL_SIZE")
+    redis_host: str = Field("localhost", validation_alias="REDIS_HOST")
+    redis_port: int = Field(6379, validation_alias="REDIS_PORT")
+    redis_db: int = Field(0, validation_alias="REDIS_DB")
+
+
+class Config(_Settings):
     """Main configuration."""
     version: str = "0.1.0"
-    log_level: str = Field("INFO", env="LOG_LEVEL")
-    metrics_port: int = Field(9090, env="METRICS_PORT")
+    log_level: str = Field("INFO", validation_alias="LOG_LEVEL")
+    metrics_port: int = Field(9090, validation_alias="METRICS_PORT")
+    
+    # Built per Config, so the environment is read at load time, not import
+    tor: TorConfig = Field(default_factory=TorConfig)
+    discovery: DiscoveryConfig = Field(default_factory=DiscoveryConfig)
+    safety: SafetyConfig = Field(default_factory=SafetyConfig)
+    database: DatabaseConfig = Field(default_factory=DatabaseConfig)
+
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "arachne"
+
+
+# Every settings class Config is built from
+_SECTIONS = (Config, TorConfig, DiscoveryConfig, SafetyConfig, DatabaseConfig)
+
+
+@lru_cache(maxsize=1)
+def _code_key() -> str:
+    """Fingerprint of the code that builds Config, so upgrades miss old pickles.
+    
+    Hashes the fields' repr (types, defaults, aliases), which changes with the
+    schema and costs far less than model_json_schema().
+    """
+    from src import __version__
+    fields = repr([(section.__name__, section.model_fields) for section in _SECTIONS])
+    schema_key = hashlib.blake2b(fields.encode(), digest_size=8).hexdigest()
+    return f"{__version__}:{pydantic.VERSION}:{schema_key}"
+
+
+def _settings_env_names() -> List[str]:
+    """Upper-case names of every environment variable Config can read."""
+    names = []
+    for section in _SECTIONS:
+        names += [
+            field.validation_alias.upper()
+            for field in section.model_fields.values()
+            if isinstance(field.validation_alias, str)
+        ]
+    return sorted(set(names))
+
+
+def _cache_dir() -> Optional[Path]:
+    """CACHE_DIR if it can be trusted with pickles holding secrets, else None.
+    
+    The directory must be ours and private. A loose one is tightened and
+    emptied, since someone else may have written into it.
+    """
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = os.lstat(CACHE_DIR)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid():
+            return None
+        if st.st_mode & 0o077:
+            os.chmod(CACHE_DIR, 0o700)
+            for stale in CACHE_DIR.glob("cfg-*.pkl"):
+                stale.unlink()
+    except OSError:
+        return None
+    return CACHE_DIR
+
+
+def _cache_file(config_path: str) -> Optional[Path]:
+    """Cache location keyed on the code, the YAML file, the .env file and the settings environment.
+    
+    Named cfg-<file key>-<state key>.pkl so stale entries for the same
+    YAML file can be found and pruned.
+    """
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    
+    config_file = Path(config_path).resolve()
+    file_stat = os.stat(config_file)
+    parts = [_code_key(), str(file_stat.st_mtime_ns), str(file_stat.st_size)]
     
-    tor: TorConfig = TorConfig()
-    discovery: DiscoveryConfig = DiscoveryConfig()
-    safety: SafetyConfig = SafetyConfig()
-    database: DatabaseConfig = DatabaseConfig()
+    # .env and environment overrides feed into Config, so they are part of the
+    # key; only the variables Config reads, not PWD, SHLVL and the like
+    env_file = Path(".env")
+    if env_file.exists():
+        env_stat = os.stat(env_file)
+        parts += [str(env_file.resolve()), str(env_stat.st_mtime_ns), str(env_stat.st_size)]
+    environ = {k.upper(): v for k, v in os.environ.items()}
+    parts += [f"{name}={environ[name]}" for name in _settings_env_names() if name in environ]
     
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = False
+    file_key = hashlib.blake2b(str(config_file).encode(), digest_size=8).hexdigest()
+    state_key = hashlib.blake2b("\0".join(parts).encode(), digest_size=8).hexdigest()
+    return cache_dir / f"cfg-{file_key}-{state_key}.pkl"
+
+
+def _read_cached_config(cache_file: Path) -> Optional[Config]:
+    """Return the pickled Config, or None if it is missing or unreadable."""
+    try:
+        with open(cache_file, 'rb') as f:
+            config = pickle.load(f)
+    except Exception:
+        # Any unreadable pickle just means a normal load
+        return None
+    return config if isinstance(config, Config) else None
+
+
+def _write_cached_config(cache_file: Path, config: Config) -> None:
+    """Atomically pickle Config; the file may hold secrets, so keep it private."""
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(config, f, protocol=5)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        
+        # Keep one entry per YAML file: drop those for its older states
+        file_key = cache_file.name.split("-")[1]
+        for stale in cache_file.parent.glob(f"cfg-{file_key}-*.pkl"):
+            if stale != cache_file:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        # Caching is best effort (e.g. read-only home directory)
+        pass
 
 
 def load_config(config_path: Optional[str] = None) -> Config:
-    """Load configuration from YAML file and environment."""
+    """Load configuration from YAML file and environment.
+    
+    The validated Config is cached under ~/.cache/arachne and reused until
+    Arachne or pydantic is upgraded, or the YAML file, the .env file or a
+    setting's environment variable changes. Within a process,
+    repeat calls for an unchanged file return the same Config.
+    """
+    mtime = os.path.getmtime(config_path) if config_path and Path(config_path).exists() else 0
+    return _load_config(config_path, mtime)
+
+
+@lru_cache(maxsize=8)
+def _load_config(config_path: Optional[str], mtime: float) -> Config:
+    """load_config, memoized on (path, mtime)."""
     config_dict = {}
+    cache_file = None
     
     # Load from YAML if provided
     if config_path and Path(config_path).exists():
+        cache_file = _cache_file(config_path)
+        cached = _read_cached_config(cache_file) if cache_file is not None else None
+        if cached is not None:
+            return cached
+        
         with open(config_path, 'r') as f:
-            config_dict = yaml.safe_load(f)
+            config_dict = yaml.load(f, Loader=YamlLoader) or {}
     
     # Load from environment
-    return Config(**config_dict)
+    config = Config(**config_dict)
+    
+    if cache_file is not None:
+        _write_cached_config(cache_file, config)
+    
+    return config
 
 
 def save_config(config: Config, config_path: str) -> None:
     """Save configuration to YAML file."""
-    config_dict = config.dict(exclude={'database'})  # Don't save passwords
+    config_dict = config.model_dump(exclude={'database'})  # Don't save passwords
     with open(config_path, 'w') as f:
         yaml.dump(config_dict, f, default_flow_style=False)
@@ -4,13 +4,19 @@ Logging configuration for Arachne.
 
 import sys
 import logging
+from functools import lru_cache
 from typing import Optional
 from loguru import logger
 
+# Plain, color-free format for log files: no ANSI markup to render per record
+FILE_FORMAT = "{time:YYYY-MM-DDTHH:mm:ss.SSSZ}|{level}|{name}|{message}"
+
 
 class InterceptHandler(logging.Handler):
     """Intercept standard logging messages toward Loguru."""
     
+    _logging_file = logging.__file__
+    
     def emit(self, record):
         # Get corresponding Loguru level if it exists
         try:
@@ -20,7 +26,7 @@ class InterceptHandler(logging.Handler):
         
         # Find caller from where originated the logged message
         frame, depth = logging.currentframe(), 2
-        while frame.f_code.co_filename == logging.__file__:
+        while frame.f_code.co_filename == self._logging_file:
             frame = frame.f_back
             depth += 1
         
@@ -41,20 +47,25 @@ def setup_logger(
     # Remove default handler
     logger.remove()
     
-    # Add stdout handler
+    # Add stdout handler; color only when a human is watching
     logger.add(
         sys.stdout,
         level=level,
         format=format,
-        colorize=True,
+        colorize=sys.stdout.isatty(),
     )
     
-    # Add file handler if specified
+    # Add file handler if specified. enqueue moves formatting and writes to a
+    # background thread so logging never blocks the event loop; backtrace and
+    # diagnose skip the per-exception frame and variable introspection.
     if log_file:
         logger.add(
             log_file,
             level=level,
-            format=format,
+            format=FILE_FORMAT,
+            enqueue=True,
+            backtrace=False,
+            diagnose=False,
             rotation=rotation,
             retention=retention,
             compression="zip",
@@ -71,6 +82,7 @@ def setup_logger(
     logger.info(f"Logger configured with level {level}")
 
 
+@lru_cache(maxsize=256)
 def get_logger(name: str) -> logger:
-    """Get logger for a module."""
+    """Get logger for a module; bound loggers are shared per name."""
     return logger.bind(name=name)